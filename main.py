@@ -1,9 +1,16 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
+import numpy as np
+import plotly.io as pio
 from utils.paper_fetcher import PaperFetcher
 from utils.ai_analyzer import PaperAnalyzer
 from utils.visualizations import Visualizer
 import time
+from pathlib import Path
 
 # Page configuration
 st.set_page_config(
@@ -12,14 +19,127 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load custom CSS
-with open("styles/custom.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Load custom CSS, reading the file only once
+@st.cache_data
+def load_css() -> str:
+    return Path("styles/custom.css").read_text()
 
-# Initialize components
-paper_fetcher = PaperFetcher()
-analyzer = PaperAnalyzer()
-visualizer = Visualizer()
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+# Initialize components once per server process
+@st.cache_resource
+def get_paper_fetcher() -> PaperFetcher:
+    return PaperFetcher()
+
+@st.cache_resource
+def get_analyzer() -> PaperAnalyzer:
+    return PaperAnalyzer()
+
+@st.cache_resource
+def get_visualizer() -> Visualizer:
+    return Visualizer()
+
+paper_fetcher = get_paper_fetcher()
+analyzer = get_analyzer()
+visualizer = get_visualizer()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_papers_cached(topic: str, count: int):
+    """Fetch papers and build their DataFrame, cached per (topic, count)."""
+    papers = asyncio.run(paper_fetcher.fetch_papers_async(count, topic=topic))
+    return papers, paper_fetcher.create_dataframe(papers)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def analyze_papers_cached(paper_ids: tuple, has_api_key: bool, _papers: list) -> pd.DataFrame:
+    """Analyze papers, cached on their arXiv IDs rather than the full paper dicts.
+
+    Results may hold fallbacks (no API key, or an outage), so they are kept in
+    memory for an hour rather than on disk; real analyses outlive restarts in
+    the analyzer's own disk cache.
+    """
+    return analyzer.analyze_batch(_papers)
+
+# Visualizer methods whose figures the dashboard shows
+FIGURE_NAMES = (
+    "create_error_distribution",
+    "create_correlation_heatmap",
+    "create_confidence_heatmap",
+    "create_paper_similarity_network",
+    "create_timeline_view",
+    "create_trend_analysis",
+    "create_topic_distribution",
+)
+
+@st.cache_data(show_spinner=False)
+def build_figures_json(df_hash: bytes, _df: pd.DataFrame) -> dict:
+    """Build every dashboard figure as Plotly JSON, cached on the hash of the results they plot."""
+    def build(name: str, df: pd.DataFrame) -> str:
+        return getattr(visualizer, name)(df).to_json()
+    
+    # The builders are independent and spend much of their time in NumPy,
+    # which releases the GIL, so they run side by side. None of them modify
+    # their input, but pandas keeps lazy internal caches on a frame, so each
+    # thread still gets its own shallow copy, made here on the calling thread.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {name: executor.submit(build, name, _df.copy(deep=False)) for name in FIGURE_NAMES}
+        return {name: future.result() for name, future in futures.items()}
+
+@st.cache_data(show_spinner=False)
+def export_csv(df_hash: bytes, _df: pd.DataFrame) -> bytes:
+    """Serialize results to CSV, cached on the hash of the results."""
+    # Write bytes straight into a buffer instead of building and re-encoding a str
+    buffer = io.BytesIO()
+    _df.to_csv(buffer, index=False, lineterminator='\n')
+    return buffer.getvalue()
+
+@st.cache_resource
+def build_column_config(categories: tuple) -> dict:
+    """Build the results table column configuration once per category set."""
+    column_config = {
+        "title": st.column_config.TextColumn(
+            "Paper Title",
+            help="Title of the research paper",
+            width="large"
+        ),
+        "published": st.column_config.DatetimeColumn(
+            "Publication Date",
+            format="DD/MM/YYYY",
+            width="medium"
+        ),
+        "url": st.column_config.LinkColumn(
+            "Paper Link",
+            help="Click to view the original paper",
+            validate="^https?://.*",
+            max_chars=None,
+            display_text="View Paper ↗",
+            width="small"
+        )
+    }
+    
+    # Configure confidence and issues columns
+    column_config.update({
+        f"{category}_confidence": st.column_config.ProgressColumn(
+            f"{category} Confidence",
+            help=f"Confidence score for {category}",
+            format="%.1f%%",
+            min_value=0,
+            max_value=100
+        )
+        for category in categories
+    })
+    column_config.update({
+        f"{category}_issues": st.column_config.NumberColumn(
+            f"{category} Issues",
+            help=f"Number of issues found in {category}"
+        )
+        for category in categories
+    })
+    return column_config
+
+@st.cache_data(show_spinner=False)
+def aggregate_patterns_cached(df_hash: bytes, _df: pd.DataFrame) -> dict:
+    """Aggregate error patterns, cached on the hash of the results."""
+    return analyzer.aggregate_patterns(_df)
 
 # Initialize session state
 if 'selected_paper_index' not in st.session_state:
@@ -53,29 +173,42 @@ with st.sidebar:
 if analyze_button:
     # Create analysis pipeline
     with st.spinner("Fetching papers..."):
-        papers = paper_fetcher.fetch_papers(paper_count, topic=search_topic)
-        papers_df = paper_fetcher.create_dataframe(papers)
+        papers, papers_df = fetch_papers_cached(search_topic, paper_count)
         
     with st.spinner("Analyzing papers..."):
-        analysis_results = analyzer.analyze_batch(papers)
+        paper_ids = tuple(paper['id'] for paper in papers)
+        analysis_results = analyze_papers_cached(paper_ids, bool(os.getenv('PPLX_API_KEY')), papers)
+        # Hash before adding categories: they are fully determined by the
+        # analyzed papers, so hashing them again adds nothing
+        results_hash = pd.util.hash_pandas_object(analysis_results).values.tobytes()
         # Add categories from original papers dataframe
-        analysis_results['categories'] = papers_df['categories']
-            
-    # Filter data based on user selections
-    filtered_results = analysis_results.copy()
+        analysis_results['categories'] = papers_df['categories'].to_numpy()
     
-    # Apply confidence filter
-    confidence_cols = [col for col in filtered_results.columns if 'confidence' in col]
-    confidence_mask = filtered_results[confidence_cols].mean(axis=1) >= min_confidence
-    filtered_results = filtered_results[confidence_mask]
+    # Keep the run so later widget interactions (paging, filters) re-render it
+    st.session_state.analysis = (papers, papers_df, analysis_results, results_hash)
+    # Map titles to paper positions once; iterating in reverse keeps the
+    # first paper when titles repeat
+    st.session_state.title_to_idx = {
+        paper['title']: i for i, paper in reversed(list(enumerate(papers)))
+    }
+    st.session_state.results_page = 1
+    # A selection indexes the previous run's papers; drop it with that run
+    st.session_state.selected_paper_index = None
+
+if 'analysis' in st.session_state:
+    papers, papers_df, analysis_results, results_hash = st.session_state.analysis
+            
+    # Filter data based on user selections; downstream use is read-only,
+    # so the mask is applied to analysis_results without copying it first
+    confidence_arr = analysis_results[analyzer.confidence_cols].to_numpy(dtype=np.float32)
+    confidence_mask = confidence_arr.mean(axis=1) >= min_confidence
+    filtered_results = analysis_results.iloc[confidence_mask]
     
     # Apply category filters
-    selected_cols = []
-    for category in selected_categories:
-        selected_cols.extend([
-            col for col in filtered_results.columns 
-            if category.lower().replace(' ', '_') in col.lower()
-        ])
+    selected_cols = [col for category in selected_categories for col in analyzer.category_cols[category]]
+    
+    # Both issue metrics reduce over the same float32 block
+    issues_arr = filtered_results[analyzer.issues_cols].to_numpy(dtype=np.float32)
     
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -84,36 +217,16 @@ if analyze_button:
     with col2:
         st.metric("Filtered Papers", len(filtered_results))
     with col3:
-        avg_issues = filtered_results[[col for col in filtered_results.columns if 'issues' in col]].mean().mean()
+        avg_issues = float(np.nanmean(issues_arr))
         st.metric("Avg Issues/Paper", f"{avg_issues:.2f}")
     with col4:
-        high_risk_papers = len(filtered_results[
-            filtered_results[[col for col in filtered_results.columns if 'issues' in col]].sum(axis=1) >= error_threshold
-        ])
+        high_risk_papers = int((issues_arr.sum(axis=1) >= error_threshold).sum())
         st.metric("High Risk Papers", high_risk_papers)
 
     # Visualizations
     st.subheader("Analysis Results")
     
-    # Get pattern analysis
-    patterns = analyzer.aggregate_patterns(analysis_results)
-    
-    # Display pattern insights
-    st.markdown("### Key Pattern Insights")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("#### Trend Analysis")
-        for category, trend in patterns['temporal_patterns']['trend_direction'].items():
-            trend_icon = "📈" if trend == "increasing" else "📉" if trend == "decreasing" else "➡️"
-            st.write(f"{trend_icon} {category}: {trend.title()}")
-    
-    with col2:
-        st.markdown("#### Strong Correlations")
-        for category, correlations in patterns['error_correlations'].items():
-            if correlations:
-                corr_text = ", ".join([f"{cat} ({corr:+.2f})" for cat, corr in correlations.items()])
-                st.write(f"🔗 {category} correlates with: {corr_text}")
+    figures = build_figures_json(results_hash, analysis_results)
     
     # Create tabs for different visualization categories
     viz_tabs = st.tabs(["Error Analysis", "Paper Relationships", "Trends", "Categories"])
@@ -122,19 +235,19 @@ if analyze_button:
         st.markdown("### Error Analysis")
         # Error distribution
         st.plotly_chart(
-            visualizer.create_error_distribution(analysis_results),
+            pio.from_json(figures["create_error_distribution"]),
             use_container_width=True
         )
         
         # Correlation heatmap
         st.plotly_chart(
-            visualizer.create_correlation_heatmap(analysis_results),
+            pio.from_json(figures["create_correlation_heatmap"]),
             use_container_width=True
         )
         
         # Confidence heatmap
         st.plotly_chart(
-            visualizer.create_confidence_heatmap(analysis_results),
+            pio.from_json(figures["create_confidence_heatmap"]),
             use_container_width=True
         )
     
@@ -142,7 +255,7 @@ if analyze_button:
         st.markdown("### Paper Relationships")
         # Paper similarity network
         st.plotly_chart(
-            visualizer.create_paper_similarity_network(analysis_results),
+            pio.from_json(figures["create_paper_similarity_network"]),
             use_container_width=True
         )
     
@@ -150,21 +263,44 @@ if analyze_button:
         st.markdown("### Temporal Analysis")
         # Enhanced timeline view
         st.plotly_chart(
-            visualizer.create_timeline_view(analysis_results),
+            pio.from_json(figures["create_timeline_view"]),
             use_container_width=True
         )
         
         # Trend analysis
         st.plotly_chart(
-            visualizer.create_trend_analysis(analysis_results),
+            pio.from_json(figures["create_trend_analysis"]),
             use_container_width=True
         )
+        
+        # Pattern analysis only feeds this tab; memoize it per result set
+        if st.session_state.get('patterns_hash') != results_hash:
+            st.session_state.patterns = aggregate_patterns_cached(results_hash, analysis_results)
+            st.session_state.patterns_hash = results_hash
+        patterns = st.session_state.patterns
+        
+        # Display pattern insights
+        st.markdown("### Key Pattern Insights")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Trend Analysis")
+            for category, trend in patterns['temporal_patterns']['trend_direction'].items():
+                trend_icon = "📈" if trend == "increasing" else "📉" if trend == "decreasing" else "➡️"
+                st.write(f"{trend_icon} {category}: {trend.title()}")
+        
+        with col2:
+            st.markdown("#### Strong Correlations")
+            for category, correlations in patterns['error_correlations'].items():
+                if correlations:
+                    corr_text = ", ".join([f"{cat} ({corr:+.2f})" for cat, corr in correlations.items()])
+                    st.write(f"🔗 {category} correlates with: {corr_text}")
     
     with viz_tabs[3]:
         st.markdown("### Category Distribution")
         # Topic distribution
         st.plotly_chart(
-            visualizer.create_topic_distribution(analysis_results),
+            pio.from_json(figures["create_topic_distribution"]),
             use_container_width=True
         )
     
@@ -175,135 +311,75 @@ if analyze_button:
     if 'selected_paper_index' not in st.session_state:
         st.session_state.selected_paper_index = None
     
-    # Prepare display dataframe
-    display_df = analysis_results.copy()
-    # Add paper URLs to display dataframe
-    display_df['url'] = papers_df['url'].apply(lambda x: str(x) if pd.notna(x) else '')
-    
-    # Ensure URLs are valid strings and properly formatted
-    def format_paper_url(url):
-        if not url or pd.isna(url):
-            return ''
-        try:
-            url_str = str(url).strip()
-            if not url_str:
-                return ''
-            if url_str.startswith('http'):
-                return url_str
-            paper_id = url_str.split('/')[-1]
-            return f'https://arxiv.org/abs/{paper_id}'
-        except Exception as e:
-            print(f"Error formatting URL {url}: {str(e)}")
-            return ''
-            
-    display_df['url'] = display_df['url'].apply(format_paper_url)
+    # Normalize paper URLs in one vectorized pass: full links pass through,
+    # bare arXiv IDs become abs links, blanks stay empty
+    urls = papers_df['url'].fillna('').astype(str).str.strip()
+    arxiv_ids = urls.str.rsplit('/', n=1).str[-1]
+    display_urls = np.where(
+        urls.str.startswith('http'),
+        urls,
+        np.where(urls != '', 'https://arxiv.org/abs/' + arxiv_ids, '')
+    )
     
     # Configure columns for better display
-    column_config = {
-        "title": st.column_config.TextColumn(
-            "Paper Title",
-            help="Title of the research paper",
-            width="large"
-        ),
-        "published": st.column_config.DatetimeColumn(
-            "Publication Date",
-            format="DD/MM/YYYY",
-            width="medium"
-        ),
-        "url": st.column_config.LinkColumn(
-            "Paper Link",
-            help="Click to view the original paper",
-            validate="^https?://.*",
-            max_chars=None,
-            display_text="View Paper ↗",
-            width="small"
-        )
-    }
-    
-    # Configure confidence and issues columns
-    for category in analyzer.error_categories:
-        conf_col = f"{category}_confidence"
-        issues_col = f"{category}_issues"
-        
-        column_config[conf_col] = st.column_config.NumberColumn(
-            f"{category} Confidence",
-            help=f"Confidence score for {category}",
-            format="%.1f%%"
-        )
-        column_config[issues_col] = st.column_config.NumberColumn(
-            f"{category} Issues",
-            help=f"Number of issues found in {category}"
-        )
+    column_config = build_column_config(tuple(analyzer.error_categories))
     
     # Add detailed error analysis section
     st.subheader("Detailed Error Analysis")
     st.info("Click on a paper in the table below to see detailed error analysis")
 
-    # Display the dataframe with configured columns and handle selection
-    selected_row = st.data_editor(
-        display_df,
+    # Only send the current page of rows to the browser
+    page_size = 50
+    page_count = max(1, -(-len(analysis_results) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="results_page")
+    # Only the page slice gets the URL column, so the full results are never
+    # cloned; both frames are built from `papers` in order, so assign positionally
+    page_rows = slice((page - 1) * page_size, page * page_size)
+    page_df = analysis_results.iloc[page_rows].assign(url=display_urls[page_rows])
+
+    # Display the read-only table with configured columns and handle selection;
+    # the key is per page so a selection never carries over to another page's rows
+    table_event = st.dataframe(
+        page_df,
         use_container_width=True,
         column_config=column_config,
         hide_index=True,
-        num_rows="dynamic",
-        key="paper_analysis_table",
-        disabled=["url"] + [col for col in display_df.columns if col not in ["title", "url"]],
-        column_order=["title", "published", "url"] + [col for col in display_df.columns if col not in ["title", "published", "url", "categories"]],
+        key=f"paper_analysis_table_{page}",
+        column_order=["title", "published", "url"] + [col for col in page_df.columns if col not in ["title", "published", "url", "categories"]],
+        on_select="rerun",
+        selection_mode="single-row",
         height=400
     )
 
     # Handle paper selection
-    if selected_row is not None and isinstance(selected_row, pd.DataFrame):
-        # Get the index of the edited/selected row
-        edited_rows = selected_row.index.difference(display_df.index)
-        if len(edited_rows) > 0:
-            selected_index = edited_rows[0]
-            selected_paper_title = display_df.iloc[selected_index]["title"]
-            selected_paper = next((p for p in papers if p['title'] == selected_paper_title), None)
-            
-            if selected_paper:
-                st.session_state.selected_paper_index = papers.index(selected_paper)
+    if table_event.selection.rows:
+        selected_paper_title = page_df.iloc[table_event.selection.rows[0]]["title"]
+        selected_paper_index = st.session_state.title_to_idx.get(selected_paper_title)
+        
+        if selected_paper_index is not None:
+            st.session_state.selected_paper_index = selected_paper_index
     
-    # Display detailed error analysis for selected paper
+    # Display detailed error analysis for selected paper, reusing the row this
+    # run already produced rather than asking the API again on every rerun
     if st.session_state.selected_paper_index is not None:
-        selected_paper = papers[st.session_state.selected_paper_index]
-        analysis = analyzer.analyze_paper(selected_paper)
+        selected_row = analysis_results.iloc[st.session_state.selected_paper_index]
         
         for category in analyzer.error_categories:
-            if category in analysis:
-                with st.expander(f"{category} Analysis"):
-                    issues = analysis[category].get('issues', [])
-                    if isinstance(issues, list) and issues:
-                        for idx, issue in enumerate(issues, 1):
-                            severity_color = {
-                                'high': 'red',
-                                'medium': 'orange',
-                                'low': 'blue'
-                            }.get(issue.get('severity', 'low'), 'gray')
-                            
-                            st.markdown(f"""
-                            ##### Issue {idx}
-                            **Location:** {issue.get('location', 'Not specified')}  
-                            **Severity:** :{severity_color}[●] {issue.get('severity', 'Not specified')}
-                            
-                            **Description:**  
-                            {issue.get('description', 'No description available')}
-                            
-                            **Context:**  
-                            > {issue.get('context', 'No context available')}
-                            
-                            **Suggestion:**  
-                            {issue.get('suggestion', 'No suggestion available')}
-                            """)
-                            st.divider()
-                    else:
-                        st.write("No specific issues found in this category.")
+            confidence_col, issues_col = analyzer.category_cols[category]
+            with st.expander(f"{category} Analysis"):
+                issue_count = int(selected_row[issues_col])
+                if issue_count:
+                    st.write(
+                        f"**Issues found:** {issue_count}  \n"
+                        f"**Confidence:** {selected_row[confidence_col]:.1f}%"
+                    )
+                else:
+                    st.write("No specific issues found in this category.")
     
     # Export functionality
-    csv = analysis_results.to_csv(index=False)
     st.download_button(
         label="Download Results CSV",
-        data=csv,
+        data=export_csv(results_hash, analysis_results),
         file_name="paper_analysis_results.csv",
         mime="text/csv"
     )
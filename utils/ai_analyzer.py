@@ -1,113 +1,58 @@
 import os
 import json
 import time
-import requests
-from typing import List, Dict
+import asyncio
+import atexit
+import hashlib
+import itertools
+import re
+import threading
+from concurrent.futures import Future
+import httpx
+from typing import List, Dict, Tuple
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import streamlit as st
+from utils.disk_cache import DiskCache
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import TokenBucket
 
-class PaperAnalyzer:
-    def __init__(self):
-        self.error_categories = [
-            "Methodology",
-            "Statistical Analysis",
-            "Data Integrity",
-            "Citation Issues",
-            "Technical Accuracy"
-        ]
-        
-    def analyze_paper(self, paper: Dict) -> Dict:
-        """Analyze a single paper for potential issues with detailed error locations."""
-        try:
-            # Create a detailed analysis prompt
-            prompt = self._generate_analysis_prompt(paper)
-            
-            # Make API call to Perplexity
-            headers = {
-                "Authorization": f"Bearer {os.getenv('PPLX_API_KEY')}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "mixtral-8x7b-instruct",
-                "messages": [{
-                    "role": "system",
-                    "content": """You are an expert scientific paper analyzer. Analyze papers for potential issues and provide detailed structured feedback in JSON format.
-                    For each issue found:
-                    1. Identify the specific location (section, paragraph, or sentence)
-                    2. Explain the nature of the problem
-                    3. Suggest potential improvements
-                    4. Rate the severity (low, medium, high)
-                    Focus on methodology, statistical analysis, data integrity, citations, and technical accuracy."""
-                }, {
-                    "role": "user",
-                    "content": prompt
-                }],
-                "max_tokens": 2048,
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-            
-            # Enhanced retry mechanism with exponential backoff
-            max_retries = 5
-            retry_delay = 1
-            response_data = None
-            
-            for attempt in range(max_retries):
-                try:
-                    # Add rate limiting delay
-                    if attempt > 0:
-                        time.sleep(retry_delay)
-                    
-                    response = requests.post(
-                        "https://api.perplexity.ai/chat/completions",
-                        headers=headers,
-                        json=payload,
-                        timeout=30  # Add timeout
-                    )
-                    
-                    if response.status_code == 429:  # Rate limit hit
-                        retry_delay = min(retry_delay * 2, 32)  # Cap at 32 seconds
-                        continue
-                        
-                    response.raise_for_status()
-                    response_data = response.json()
-                    break
-                    
-                except requests.exceptions.Timeout:
-                    print(f"Timeout on attempt {attempt + 1}")
-                    retry_delay = min(retry_delay * 2, 32)
-                    
-                except requests.exceptions.RequestException as e:
-                    print(f"API error on attempt {attempt + 1}: {str(e)}")
-                    if attempt == max_retries - 1:
-                        raise e
-                    retry_delay = min(retry_delay * 2, 32)
-            
-            if response_data is None:
-                raise Exception("Failed to get valid response after all retries")
-            
-            # Parse the response
-            if 'choices' in response_data and response_data['choices']:
-                return self._parse_analysis_response(response_data['choices'][0]['message']['content'])
-            else:
-                raise ValueError("Unexpected API response format")
-            
-        except Exception as e:
-            print(f"Error calling Perplexity API: {e}")
-            return self._generate_fallback_analysis()
+# orjson parses and serializes several times faster; stdlib json is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    json_dumps = lambda obj: json.dumps(obj).encode()
 
-    def _generate_analysis_prompt(self, paper: Dict) -> str:
-        """Generate detailed analysis prompt for the paper with error locations."""
-        return f"""Analyze this scientific paper and provide a detailed structured assessment focusing on potential issues, their locations, and quality metrics.
+PPLX_API_URL = "https://api.perplexity.ai/chat/completions"
+
+# Client-side request budget, kept under the API's per-minute limit
+PPLX_REQUESTS_PER_MINUTE = 50
+
+# Cached analyses are refreshed after 30 days
+CACHE_TTL = 30 * 86400
+
+# Number of precomputed fallback analyses cycled through when the API fails
+FALLBACK_POOL_SIZE = 1024
+
+NON_WORD_RE = re.compile(r'\W+')
+
+SYSTEM_PROMPT = """You are an expert scientific paper analyzer. Analyze papers for potential issues and report, for each category, how many issues you found and how confident you are, in JSON format.
+Focus on methodology, statistical analysis, data integrity, citations, and technical accuracy."""
+
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Prompt templates are filled with str.format; doubled braces are literal JSON
+ANALYSIS_PROMPT_TEMPLATE = """Analyze this scientific paper and provide a structured assessment of its potential issues.
 
 INPUT PAPER:
-Title: {paper['title']}
-Abstract: {paper['abstract']}
-Authors: {paper['authors']}
-Published: {paper['published']}
+Title: {title}
+Abstract: {abstract}
+Authors: {authors}
+Published: {published}
 
 REQUIRED OUTPUT FORMAT:
 Provide a JSON object with the following structure for each category:
@@ -115,15 +60,7 @@ Provide a JSON object with the following structure for each category:
 {{
     "methodology": {{
         "confidence": <0-100 score>,
-        "issues": [{{
-            "location": <specific location in paper>,
-            "description": <detailed issue description>,
-            "suggestion": <improvement suggestion>,
-            "severity": <"low"|"medium"|"high">,
-            "context": <relevant text excerpt>
-        }}],
-        "overall_severity": <"low"|"medium"|"high">,
-        "key_points": [<list of main points>]
+        "issues": <number of issues found>
     }},
     "statistical_analysis": {{ ... }},
     "data_integrity": {{ ... }},
@@ -134,8 +71,6 @@ Provide a JSON object with the following structure for each category:
 ANALYSIS GUIDELINES:
 - Confidence: Assess how confident you are in detecting issues (0-100)
 - Issues: Count specific problems found (integer)
-- Severity: Rate overall severity based on impact
-- Key Points: List 2-3 most important observations
 
 Focus on:
 1. Methodology: Research design, approach validity, controls
@@ -146,100 +81,532 @@ Focus on:
 
 Return ONLY the JSON object, no additional text.
 """
+
+BATCH_PROMPT_TEMPLATE = """Analyze these {count} scientific papers and assess each one for potential issues.
+
+INPUT PAPERS:
+{paper_list}
+
+REQUIRED OUTPUT FORMAT:
+Provide a JSON list with one object per paper:
+
+[{{
+    "paper_index": <index of the paper in the list above>,
+    "categories": {{
+        "methodology": {{"confidence": <0-100 score>, "issues": <number of issues found>}},
+        "statistical_analysis": {{ ... }},
+        "data_integrity": {{ ... }},
+        "citation_issues": {{ ... }},
+        "technical_accuracy": {{ ... }}
+    }}
+}}]
+
+ANALYSIS GUIDELINES:
+- Confidence: Assess how confident you are in detecting issues (0-100)
+- Issues: Count specific problems found (integer)
+
+Return ONLY the JSON list, no additional text.
+"""
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """Whether an exception is a 429 reply: the API is throttling, not failing."""
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """Whether an exception should count against the API's health."""
+    return not _is_rate_limited(exc)
+
+class PaperAnalyzer:
+    # Shared by every analyzer so all sessions stop calling a failing API
+    # together; 429 replies are throttling and leave the breaker untouched
+    _breaker = CircuitBreaker(failure_threshold=5, cooldown=60, is_failure=_is_upstream_failure)
+    # Likewise shared, so concurrent sessions together stay within the rate limit
+    _rate_limiter = TokenBucket(rate=PPLX_REQUESTS_PER_MINUTE / 60, capacity=10)
+
+    def __init__(self):
+        self.error_categories = [
+            "Methodology",
+            "Statistical Analysis",
+            "Data Integrity",
+            "Citation Issues",
+            "Technical Accuracy"
+        ]
+        # Result columns follow the "<category>_<metric>" naming
+        self.confidence_cols = [f"{category}_confidence" for category in self.error_categories]
+        self.issues_cols = [f"{category}_issues" for category in self.error_categories]
+        # (category, JSON key) pairs, e.g. ("Data Integrity", "data_integrity")
+        self._category_keys = [
+            (category, category.lower().replace(' ', '_')) for category in self.error_categories
+        ]
+        self.category_cols = {
+            category: [f"{category}_confidence", f"{category}_issues"]
+            for category in self.error_categories
+        }
+        self._rng = np.random.default_rng()
+        # Fallbacks are drawn once and handed out round-robin, so a failing API
+        # costs an index bump per paper; the dicts are shared and never mutated
+        self._fallback_pool = self._generate_fallback_analyses(FALLBACK_POOL_SIZE)
+        self._fallback_idx = itertools.cycle(range(FALLBACK_POOL_SIZE))
+        # Completed analyses persist across app restarts
+        self._cache = DiskCache(".cache/analyzer")
+        # One pooled client keeps connections alive across synchronous calls
+        self._client = httpx.Client(timeout=30)
+        atexit.register(self._client.close)
+        # Analyses currently being requested, so concurrent callers share one call
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+    def analyze_paper(self, paper: Dict) -> Dict:
+        """Analyze a single paper for potential issues with detailed error locations."""
+        if not os.getenv('PPLX_API_KEY'):
+            return self._generate_fallback_analysis()
+        
+        try:
+            return self._analyze_paper_cached(paper)
+            
+        except Exception as e:
+            print(f"Error calling Perplexity API: {e}")
+            return self._generate_fallback_analysis()
+
+    def _analyze_paper_cached(self, paper: Dict) -> Dict:
+        """Analyze a paper through the disk cache, so entries expire after CACHE_TTL.
+
+        Failures, including replies that are not a complete analysis, raise and
+        are not cached.
+        """
+        key = self._cache_key(paper)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        future, owner = self._claim_inflight(key)
+        if not owner:
+            return future.result()
+        
+        try:
+            payload = self._build_payload(self._generate_analysis_prompt(paper))
+            response_data = self._request_completion(payload)
+            analysis = self._extract_analysis(response_data)
+            self._cache.set(key, analysis, expire=CACHE_TTL)
+            future.set_result(analysis)
+            return analysis
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._release_inflight(key, future)
+
+    def _request_completion(self, payload: Dict) -> Dict:
+        """POST a chat completion request, retrying with exponential backoff."""
+        headers = self._build_headers()
+        # Serialize once; retries resend the same bytes
+        body = json_dumps(payload)
+        
+        # Enhanced retry mechanism with exponential backoff
+        max_retries = 5
+        retry_delay = 1
+        wait = 0
+        response_data = None
+        
+        for attempt in range(max_retries):
+            try:
+                # Add rate limiting delay
+                if attempt > 0:
+                    time.sleep(wait)
+                
+                # Raises CircuitOpenError without a request while the API is failing
+                with self._breaker.guard():
+                    # Pace requests up front so 429s stay rare
+                    self._rate_limiter.acquire()
+                    response = self._client.post(PPLX_API_URL, headers=headers, content=body)
+                    response_data = self._decode_response(response)
+                break
+                
+            except httpx.TimeoutException:
+                print(f"Timeout on attempt {attempt + 1}")
+                wait, retry_delay = retry_delay, min(retry_delay * 2, 32)
+                
+            except httpx.HTTPError as e:
+                print(f"API error on attempt {attempt + 1}: {str(e)}")
+                if attempt == max_retries - 1:
+                    raise e
+                wait, retry_delay = self._retry_wait(e, retry_delay), min(retry_delay * 2, 32)
+        
+        if response_data is None:
+            raise Exception("Failed to get valid response after all retries")
+        
+        return response_data
+
+    async def _analyze_paper_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, paper: Dict) -> Dict:
+        """Async counterpart of analyze_paper that shares one HTTP client across a batch."""
+        key = self._cache_key(paper)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        future, owner = self._claim_inflight(key)
+        if not owner:
+            try:
+                return await asyncio.wrap_future(future)
+            except Exception as e:
+                print(f"Error calling Perplexity API: {e}")
+                return self._generate_fallback_analysis()
+        
+        try:
+            payload = self._build_payload(self._generate_analysis_prompt(paper))
+            response_data = await self._request_completion_async(client, semaphore, payload)
+            analysis = self._extract_analysis(response_data)
+            self._cache.set(key, analysis, expire=CACHE_TTL)
+            future.set_result(analysis)
+            return analysis
+            
+        except Exception as e:
+            future.set_exception(e)
+            print(f"Error calling Perplexity API: {e}")
+            return self._generate_fallback_analysis()
+        finally:
+            self._release_inflight(key, future)
+
+    async def _analyze_chunk_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, papers: List[Dict]) -> List[Dict]:
+        """Analyze a chunk of papers with one batched request, falling back per paper."""
+        keys = [self._cache_key(paper) for paper in papers]
+        analyses = [self._cache.get(key) for key in keys]
+        
+        # Only papers without a cached analysis go into the batched prompt
+        pending = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if len(pending) > 1:
+            try:
+                payload = self._build_batch_payload([papers[i] for i in pending])
+                response_data = await self._request_completion_async(client, semaphore, payload)
+                batch_entries = self._extract_batch_entries(response_data, len(pending))
+            except Exception as e:
+                print(f"Error calling Perplexity API: {e}")
+                batch_entries = [None] * len(pending)
+            
+            for i, analysis in zip(pending, batch_entries):
+                if analysis is not None:
+                    self._cache.set(keys[i], analysis, expire=CACHE_TTL)
+                    analyses[i] = analysis
+        
+        # Papers the batch could not answer go through the single-paper path
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        singles = await asyncio.gather(*(
+            self._analyze_paper_async(client, semaphore, papers[i]) for i in missing
+        ))
+        for i, analysis in zip(missing, singles):
+            analyses[i] = analysis
+        return analyses
+
+    async def _request_completion_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, payload: Dict) -> Dict:
+        """Async counterpart of _request_completion, without blocking the event loop."""
+        # Serialize once; retries resend the same bytes
+        body = json_dumps(payload)
+        max_retries = 5
+        retry_delay = 1
+        wait = 0
+        response_data = None
+        
+        for attempt in range(max_retries):
+            try:
+                if attempt > 0:
+                    await asyncio.sleep(wait)
+                
+                # Raises CircuitOpenError without a request while the API is failing
+                with self._breaker.guard():
+                    # Pace requests up front so 429s stay rare
+                    await self._rate_limiter.acquire_async()
+                    # Bound the number of in-flight requests across the batch
+                    async with semaphore:
+                        response = await client.post(PPLX_API_URL, content=body)
+                    response_data = self._decode_response(response)
+                break
+                
+            except httpx.TimeoutException:
+                print(f"Timeout on attempt {attempt + 1}")
+                wait, retry_delay = retry_delay, min(retry_delay * 2, 32)
+                
+            except httpx.HTTPError as e:
+                print(f"API error on attempt {attempt + 1}: {str(e)}")
+                if attempt == max_retries - 1:
+                    raise e
+                wait, retry_delay = self._retry_wait(e, retry_delay), min(retry_delay * 2, 32)
+        
+        if response_data is None:
+            raise Exception("Failed to get valid response after all retries")
+        
+        return response_data
+
+    @staticmethod
+    def _retry_wait(error: httpx.HTTPError, retry_delay: float) -> float:
+        """Seconds to wait before retrying: a 429's Retry-After if given, else the backoff delay."""
+        if _is_rate_limited(error):
+            try:
+                return max(0.0, float(error.response.headers['Retry-After']))
+            except (KeyError, ValueError):
+                pass
+        return retry_delay
+
+    def _decode_response(self, response: httpx.Response) -> Dict:
+        """Parse a completion response, rejecting errors and payloads without choices."""
+        if not response.is_success:
+            response.raise_for_status()
+        # Parse the raw bytes directly instead of decoding to text first
+        response_data = json_loads(response.content)
+        if not isinstance(response_data, dict) or not response_data.get('choices'):
+            raise ValueError("Unexpected API response format")
+        return response_data
+
+    def _claim_inflight(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller now owns it."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _release_inflight(self, key: str, future: Future) -> None:
+        """Drop an owned in-flight future, failing it if the owner never resolved it."""
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        # Cancellation skips the owner's except clause; don't leave waiters hanging
+        if not future.done():
+            future.set_exception(RuntimeError("Analysis was abandoned before completing"))
+
+    def _cache_key(self, paper: Dict) -> str:
+        """Fingerprint a paper's title and abstract for caching.
+
+        Text is case-folded and stripped of punctuation and whitespace runs first,
+        so resubmissions that differ only in formatting share one cached analysis.
+        """
+        text = NON_WORD_RE.sub(' ', f"{paper['title']} {paper['abstract']}".casefold()).strip()
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _build_headers(self) -> Dict:
+        """Build the Perplexity API request headers."""
+        return {
+            "Authorization": f"Bearer {os.getenv('PPLX_API_KEY')}",
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+
+    def _build_payload(self, prompt: str, max_tokens: int = 2048) -> Dict:
+        """Build the chat completion payload for an analysis prompt."""
+        return {
+            "model": "mixtral-8x7b-instruct",
+            "messages": [SYSTEM_MESSAGE, {
+                "role": "user",
+                "content": prompt
+            }],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "top_p": 0.9
+        }
+
+    def _build_batch_payload(self, papers: List[Dict]) -> Dict:
+        """Build the chat completion payload for analyzing several papers at once."""
+        return self._build_payload(
+            self._generate_batch_prompt(papers),
+            max_tokens=max(2048, 256 * len(papers))
+        )
+
+    def _extract_analysis(self, response_data: Dict) -> Dict:
+        """Pull the model output out of a chat completion response and parse it."""
+        return self._parse_analysis_response(response_data['choices'][0]['message']['content'])
+
+    def _extract_batch_entries(self, response_data: Dict, count: int) -> List:
+        """Parse a batched response into per-paper analyses, None where one is missing."""
+        return self._parse_batch_entries(response_data['choices'][0]['message']['content'], count)
+
+    def _generate_analysis_prompt(self, paper: Dict) -> str:
+        """Generate detailed analysis prompt for the paper with error locations."""
+        return ANALYSIS_PROMPT_TEMPLATE.format_map(paper)
+
+    def _generate_batch_prompt(self, papers: List[Dict]) -> str:
+        """Generate a single analysis prompt covering several papers."""
+        paper_list = "\n\n".join(
+            f"[{i}] Title: {paper['title']}\nAbstract: {paper['abstract']}"
+            for i, paper in enumerate(papers)
+        )
+        return BATCH_PROMPT_TEMPLATE.format(count=len(papers), paper_list=paper_list)
         
     def _parse_analysis_response(self, response_text: str) -> Dict:
-        """Parse API response into structured analysis."""
+        """Parse API response into structured analysis.
+
+        Raises ValueError when the reply is not a complete analysis, so callers
+        fall back without caching anything.
+        """
         try:
             # Try to parse the response as JSON
-            analysis = json.loads(response_text)
+            analysis = json_loads(response_text)
+            return self._normalize_analysis(analysis)
             
-            # Normalize the response to match expected format
-            normalized = {}
-            for category in self.error_categories:
-                category_key = category.lower().replace(' ', '_')
-                if category_key in analysis:
-                    normalized[category] = {
-                        'confidence': min(100, max(0, analysis[category_key]['confidence'])),
-                        'issues': max(0, analysis[category_key]['issues'])
-                    }
-                else:
-                    normalized[category] = self._generate_fallback_analysis()[category]
-                    
-            return normalized
-            
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ValueError(f"Error parsing API response: {e}") from e
+
+    def _parse_batch_entries(self, response_text: str, count: int) -> List:
+        """Parse a batched API response into one analysis per paper, None where missing.
+
+        Only complete entries count: one that lacks a category, or a paper the
+        reply answers more than once, is left as None so it is never cached.
+        """
+        analyses = [None] * count
+        answered = set()
+        try:
+            entries = json_loads(response_text)
+            for entry in entries:
+                try:
+                    index = int(entry['paper_index'])
+                    if not 0 <= index < count:
+                        continue
+                    if index in answered:
+                        # Conflicting answers for one paper; trust neither
+                        print(f"Error parsing batch entry: paper {index} answered more than once")
+                        analyses[index] = None
+                        continue
+                    answered.add(index)
+                    analyses[index] = self._normalize_analysis(entry['categories'])
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"Error parsing batch entry: {e}")
+        except (json.JSONDecodeError, TypeError) as e:
             print(f"Error parsing API response: {e}")
-            return self._generate_fallback_analysis()
+        return analyses
+
+    def _normalize_analysis(self, analysis: Dict) -> Dict:
+        """Normalize a parsed analysis to match the expected format.
+
+        Raises KeyError if a category is missing; filling it in with made-up
+        numbers would get them cached as if the model had returned them.
+        """
+        normalized = {}
+        for category, category_key in self._category_keys:
+            normalized[category] = {
+                'confidence': min(100, max(0, analysis[category_key]['confidence'])),
+                'issues': max(0, analysis[category_key]['issues'])
+            }
+                
+        return normalized
 
     def _generate_fallback_analysis(self) -> Dict:
         """Generate fallback analysis when API call fails."""
-        import random
-        return {
-            category: {
-                'confidence': random.randint(60, 100),
-                'issues': random.randint(0, 3)
+        return self._fallback_pool[next(self._fallback_idx)]
+
+    def _generate_fallback_analyses(self, n: int) -> List[Dict]:
+        """Generate fallback analyses for n papers from one vectorized draw."""
+        confidences, issues = self._fallback_batch(n)
+        return [
+            {
+                category: {'confidence': confidence, 'issues': issue_count}
+                for category, confidence, issue_count in zip(self.error_categories, confidence_row, issues_row)
             }
-            for category in self.error_categories
-        }
+            for confidence_row, issues_row in zip(confidences.tolist(), issues.tolist())
+        ]
+
+    def _fallback_batch(self, n: int):
+        """Draw fallback confidence scores and issue counts as (n, categories) arrays."""
+        shape = (n, len(self.error_categories))
+        return self._rng.integers(60, 101, size=shape), self._rng.integers(0, 4, size=shape)
+
+    def analyze_batch(self, papers: List[Dict], max_concurrency: int = 8) -> pd.DataFrame:
+        """Analyze a batch of papers concurrently with progress tracking."""
+        if not os.getenv('PPLX_API_KEY'):
+            # Every request would fail anyway; draw the whole batch's fallback at once
+            confidences, issues = self._fallback_batch(len(papers))
+            return self._build_results_frame(
+                papers, confidences.astype(np.float32), issues.astype(np.uint8)
+            )
+        return asyncio.run(self._analyze_batch_async(papers, max_concurrency))
 
-    def analyze_batch(self, papers: List[Dict]) -> pd.DataFrame:
-        """Analyze a batch of papers with parallel processing and progress tracking."""
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        import math
+    async def analyze_batch_stream(self, papers: List[Dict], max_concurrency: int = 8, chunk_size: int = 5):
+        """Yield (index, analysis) pairs as each chunk of papers completes."""
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        results = []
+        # Papers with identical text (e.g. repeated submissions) share one request
+        indices_by_key = {}
+        for index, paper in enumerate(papers):
+            indices_by_key.setdefault(self._cache_key(paper), []).append(index)
+        groups = list(indices_by_key.values())
+        
+        async def process_chunk(client, chunk_groups):
+            chunk_papers = [papers[indices[0]] for indices in chunk_groups]
+            try:
+                analyses = await self._analyze_chunk_async(client, semaphore, chunk_papers)
+            except Exception as e:
+                print(f"Error analyzing papers: {str(e)}")
+                analyses = self._generate_fallback_analyses(len(chunk_papers))
+            return chunk_groups, analyses
+        
+        # One client keeps connections alive across all requests in the batch,
+        # with a pool sized to the concurrency cap so no connection sits idle
+        limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        async with httpx.AsyncClient(headers=self._build_headers(), timeout=30, limits=limits) as client:
+            # Each chunk of papers shares one prompt and one round trip
+            tasks = [
+                asyncio.ensure_future(process_chunk(client, groups[start:start + chunk_size]))
+                for start in range(0, len(groups), chunk_size)
+            ]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    chunk_groups, analyses = await next_result
+                    for indices, analysis in zip(chunk_groups, analyses):
+                        for index in indices:
+                            yield index, analysis
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _analyze_batch_async(self, papers: List[Dict], max_concurrency: int) -> pd.DataFrame:
+        """Collect streamed results in paper order while previewing partial results."""
         total_papers = len(papers)
         processed_papers = 0
         
+        # Scores land straight in preallocated (paper, category) arrays; confidence
+        # is a 0-100 score and issue counts are small integers, so narrow dtypes
+        # cut the bytes every later reduction has to scan
+        confidences = np.empty((total_papers, len(self.error_categories)), dtype=np.float32)
+        issues = np.empty((total_papers, len(self.error_categories)), dtype=np.uint8)
+        done = np.zeros(total_papers, dtype=bool)
+        
         # Initialize progress
         progress_bar = st.progress(0.0, text="Starting paper analysis...")
         status_text = st.empty()
+        preview = st.empty()
+        # Redrawing the preview table per paper would dominate large batches
+        preview_every = max(1, total_papers // 20)
         
-        # Calculate optimal batch size and worker count
-        batch_size = min(10, math.ceil(total_papers / 4))  # Process in smaller batches
-        max_workers = min(4, total_papers)  # Limit concurrent workers
-        
-        def process_paper(paper):
-            try:
-                analysis = self.analyze_paper(paper)
-                return {
-                    'title': paper['title'],
-                    'published': paper['published'],
-                    **{f"{category}_confidence": data['confidence'] for category, data in analysis.items()},
-                    **{f"{category}_issues": data['issues'] for category, data in analysis.items()}
-                }
-            except Exception as e:
-                print(f"Error analyzing paper {paper['title']}: {str(e)}")
-                fallback = self._generate_fallback_analysis()
-                return {
-                    'title': paper['title'],
-                    'published': paper['published'],
-                    **{f"{category}_confidence": data['confidence'] for category, data in fallback.items()},
-                    **{f"{category}_issues": data['issues'] for category, data in fallback.items()}
-                }
-        
-        # Process papers in parallel batches
-        for i in range(0, total_papers, batch_size):
-            batch = papers[i:i + batch_size]
+        async for index, analysis in self.analyze_batch_stream(papers, max_concurrency):
+            confidences[index] = [analysis[category]['confidence'] for category in self.error_categories]
+            # Saturate rather than overflow on implausibly large issue counts
+            issues[index] = np.minimum(
+                [analysis[category]['issues'] for category in self.error_categories],
+                np.iinfo(np.uint8).max
+            )
+            done[index] = True
             
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_paper = {executor.submit(process_paper, paper): paper for paper in batch}
-                
-                for future in as_completed(future_to_paper):
-                    result = future.result()
-                    results.append(result)
-                    processed_papers += 1
-                    
-                    # Update progress
-                    progress = processed_papers / total_papers
-                    progress_bar.progress(progress)
-                    status_text.text(f"Analyzed {processed_papers}/{total_papers} papers")
-                    
-                    # Minimal delay between batches to avoid rate limiting
-                    time.sleep(0.1)
+            # Update progress
+            processed_papers += 1
+            progress_bar.progress(processed_papers / total_papers)
+            status_text.text(f"Analyzed {processed_papers}/{total_papers} papers")
+            if processed_papers % preview_every == 0 and processed_papers < total_papers:
+                preview.dataframe(
+                    self._build_results_frame(
+                        [papers[i] for i in np.flatnonzero(done)], confidences[done], issues[done]
+                    ),
+                    hide_index=True
+                )
         
+        preview.empty()
         status_text.text("Analysis complete!")
-        return pd.DataFrame(results)
+        return self._build_results_frame(papers, confidences, issues)
+
+    def _build_results_frame(self, papers: List[Dict], confidences: np.ndarray, issues: np.ndarray) -> pd.DataFrame:
+        """Assemble the results DataFrame column by column from (paper, category) arrays."""
+        return pd.DataFrame({
+            'title': [paper['title'] for paper in papers],
+            'published': [paper['published'] for paper in papers],
+            **{col: confidences[:, i] for i, col in enumerate(self.confidence_cols)},
+            **{col: issues[:, i] for i, col in enumerate(self.issues_cols)}
+        })
 
     def aggregate_patterns(self, results: pd.DataFrame) -> Dict:
         """Aggregate and analyze error patterns across papers with enhanced detection."""
@@ -251,41 +618,50 @@ Return ONLY the JSON object, no additional text.
             'temporal_patterns': {}
         }
         
+        # All pairwise issue correlations in one NumPy pass
+        issues_matrix = results[self.issues_cols].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr_matrix = np.corrcoef(issues_matrix, rowvar=False)
+        
+        # Bucket every category's issue counts as low (<=1), medium (<=3) and high
+        # at once; offsetting each category's codes lets one bincount tally them all
+        n_categories = len(self.error_categories)
+        severity_codes = np.digitize(issues_matrix, [1, 3], right=True) + 3 * np.arange(n_categories)
+        severity_counts = np.bincount(severity_codes.ravel(), minlength=3 * n_categories).reshape(n_categories, 3)
+        
+        # Confidence summary statistics for all categories in one aggregation
+        confidence_stats = results[self.confidence_cols].agg(['mean', 'std', 'median'])
+        
         # Analyze each category
-        for category in self.error_categories:
+        for i, category in enumerate(self.error_categories):
             confidence_col = f"{category}_confidence"
-            issues_col = f"{category}_issues"
             
             # Basic statistics
             pattern_stats['confidence_trends'][category] = {
-                'mean': results[confidence_col].mean(),
-                'std': results[confidence_col].std(),
-                'median': results[confidence_col].median(),
+                'mean': confidence_stats.at['mean', confidence_col],
+                'std': confidence_stats.at['std', confidence_col],
+                'median': confidence_stats.at['median', confidence_col],
                 'trend': self._calculate_trend(results[confidence_col])
             }
             
             pattern_stats['severity_distribution'][category] = {
-                'low': len(results[results[issues_col] <= 1]),
-                'medium': len(results[(results[issues_col] > 1) & (results[issues_col] <= 3)]),
-                'high': len(results[results[issues_col] > 3])
+                'low': int(severity_counts[i, 0]),
+                'medium': int(severity_counts[i, 1]),
+                'high': int(severity_counts[i, 2])
             }
             
             # Calculate correlations with other categories
             correlations = {}
-            for other_cat in self.error_categories:
+            for j, other_cat in enumerate(self.error_categories):
                 if other_cat != category:
-                    other_issues = f"{other_cat}_issues"
-                    corr = results[issues_col].corr(results[other_issues])
+                    corr = corr_matrix[i, j]
                     if abs(corr) > 0.3:  # Only include significant correlations
-                        correlations[other_cat] = round(corr, 2)
+                        correlations[other_cat] = round(float(corr), 2)
             
             pattern_stats['error_correlations'][category] = correlations
         
         # Analyze temporal patterns
-        results['year_month'] = pd.to_datetime(results['published']).dt.to_period('M')
-        temporal_data = results.groupby('year_month').agg({
-            f"{cat}_issues": ['mean', 'std'] for cat in self.error_categories
-        }).tail(6)  # Last 6 months
+        temporal_data = self._monthly_issue_stats(results, issues_matrix).tail(6)  # Last 6 months
         
         pattern_stats['temporal_patterns'] = {
             'monthly_averages': temporal_data.to_dict(),
@@ -294,6 +670,38 @@ Return ONLY the JSON object, no additional text.
         
         return pattern_stats
         
+    def _monthly_issue_stats(self, results: pd.DataFrame, issues_matrix: np.ndarray) -> pd.DataFrame:
+        """Per-month mean and std of each category's issue counts.
+
+        Months are bucketed as integer Period ordinals and reduced with bincount,
+        avoiding a Period object per row; the result has the same shape as a
+        groupby on monthly periods with ['mean', 'std'] per issues column.
+        """
+        published = pd.to_datetime(results['published'])
+        valid = published.notna().to_numpy()
+        # Monthly Period ordinals count months since 1970-01
+        ordinals = (published.dt.year * 12 + published.dt.month - 1 - 1970 * 12).to_numpy()[valid].astype(np.int64)
+        values = issues_matrix[valid]
+        
+        months, month_idx = np.unique(ordinals, return_inverse=True)
+        counts = np.bincount(month_idx, minlength=len(months))
+        
+        columns = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, col in enumerate(self.issues_cols):
+                means = np.bincount(month_idx, weights=values[:, i], minlength=len(months)) / counts
+                # Two-pass sample variance (ddof=1); single-paper months get NaN
+                deviations = values[:, i] - means[month_idx]
+                sq_dev = np.bincount(month_idx, weights=deviations ** 2, minlength=len(months))
+                stds = np.where(counts > 1, np.sqrt(sq_dev / (counts - 1)), np.nan)
+                columns[(col, 'mean')] = means
+                columns[(col, 'std')] = stds
+        
+        return pd.DataFrame(
+            columns,
+            index=pd.PeriodIndex.from_ordinals(months, freq='M', name='year_month')
+        )
+
     def _calculate_trend(self, series: pd.Series) -> str:
         """Calculate the trend direction of a series."""
         if len(series) < 2:
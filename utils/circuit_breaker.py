@@ -0,0 +1,78 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the breaker is open."""
+
+class CircuitBreaker:
+    """Stop calling a failing upstream until it has had time to recover.
+
+    After failure_threshold consecutive failures the breaker opens and rejects
+    calls for cooldown seconds. It then lets a single probe call through: success
+    closes the breaker again, failure reopens it for another cooldown.
+
+    is_failure decides which exceptions count against the upstream; the others
+    (e.g. rate-limit replies) neither count as failures nor close the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0,
+                 is_failure: Optional[Callable[[Exception], bool]] = None):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.is_failure = is_failure or (lambda exc: True)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed right now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probe_in_flight or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            # Half-open: exactly one caller gets to probe the upstream
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    @contextmanager
+    def guard(self):
+        """Run the enclosed call through the breaker, raising CircuitOpenError if it is open."""
+        if not self.allow():
+            raise CircuitOpenError("Circuit is open; skipping call")
+        try:
+            yield
+        except Exception as exc:
+            if self.is_failure(exc):
+                self.record_failure()
+            else:
+                self._release_probe()
+            raise
+        except BaseException:
+            # A cancelled call says nothing about upstream health
+            self._release_probe()
+            raise
+        else:
+            self.record_success()
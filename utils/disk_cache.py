@@ -0,0 +1,52 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+class DiskCache:
+    """Minimal persistent key-value cache backed by a single SQLite file."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "cache.db"),
+            check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if it is missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return pickle.loads(row[0]) if row is not None else default
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        """Store value under key, replacing any existing entry.
+
+        If expire is given, the entry is treated as missing after that many seconds.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + expire if expire is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, expires_at)
+            )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return row is not None
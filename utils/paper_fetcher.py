@@ -1,23 +1,71 @@
 import arxiv
+import asyncio
+import hashlib
+import httpx
+import io
 import pandas as pd
-from typing import List, Dict
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from operator import attrgetter
+from typing import List, Dict, Optional
 import random
-import time
-import streamlit as st
+import re
+from utils.disk_cache import DiskCache
+from utils.rate_limiter import TokenBucket
+
+# Streamlit is only needed to draw progress bars; without it the fetcher
+# still works, silently
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+ATOM_ENTRY_TAG = '{http://www.w3.org/2005/Atom}entry'
+
+# arXiv asks API clients to leave about 3 seconds between requests; a few
+# requests may go out back to back before the pacing kicks in
+ARXIV_REQUEST_INTERVAL = 3.0
+ARXIV_BURST = 4
+
+# Fetched result pages are reused for a day before arXiv is asked again
+PAGE_CACHE_TTL = 86400
+
+_author_name = attrgetter('name')
+
+# Fields every fetched paper dict carries, in DataFrame column order
+PAPER_FIELDS = ('id', 'title', 'abstract', 'authors', 'published', 'url', 'categories')
 
 class PaperFetcher:
     def __init__(self):
-        self.client = arxiv.Client()
+        # Page size matches the fetch batch size, so each API request returns
+        # only the results a batch uses (the client default is 100 per page)
+        self.client = arxiv.Client(page_size=25)
+        # Result pages keyed by the query that produced them
+        self._cache = DiskCache(".cache/arxiv")
+        # Shared by the sync and async paths so every arXiv request is paced
+        self._rate_limiter = TokenBucket(rate=1 / ARXIV_REQUEST_INTERVAL, capacity=ARXIV_BURST)
+
+    def fetch_papers(self, count: int = 1000, topic: str = None, show_progress: bool = True,
+                     batch_size: int = 25) -> List[Dict]:
+        """Fetch papers from arXiv based on topic or randomly if no topic provided.
 
-    def fetch_papers(self, count: int = 1000, topic: str = None) -> List[Dict]:
-        """Fetch papers from arXiv based on topic or randomly if no topic provided."""
+        The app uses fetch_papers_async; this blocking version is kept for
+        existing callers of the synchronous API.
+        """
         papers = []
-        batch_size = 25  # Smaller batch size to avoid rate limits
+        show_progress = show_progress and st is not None
         max_retries = 3
         categories = ["cs", "physics", "math"]
         retry_delay = 2  # Initial delay between retries in seconds
+        # Resume each query where its previous batch ended instead of re-reading page one
+        query_offsets = {}
+        # Cross-listed papers can come back from more than one category query
+        seen_ids = set()
         
-        st.progress(0.0, text="Initializing paper fetch...")
+        if show_progress:
+            st.progress(0.0, text="Initializing paper fetch...")
         
         while len(papers) < count and max_retries > 0:
             try:
@@ -29,48 +77,218 @@ class PaperFetcher:
                     category = random.choice(categories)
                     query = f"cat:{category}.*"
                 
-                search = arxiv.Search(
-                    query=query,
-                    max_results=min(batch_size, count - len(papers)),
-                    sort_by=arxiv.SortCriterion.Relevance if topic else arxiv.SortCriterion.SubmittedDate
-                )
+                sort_by = arxiv.SortCriterion.Relevance if topic else arxiv.SortCriterion.SubmittedDate
+                offset = query_offsets.get(query, 0)
+                batch_papers = self._fetch_batch(query, sort_by, min(batch_size, count - len(papers)), offset)
+                query_offsets[query] = offset + len(batch_papers)
+                if not batch_papers:
+                    # The query is exhausted; don't keep asking for the same empty page
+                    max_retries -= 1
                 
-                batch_papers = []
-                for result in self.client.results(search):
-                    batch_papers.append({
-                        'title': result.title,
-                        'abstract': result.summary,
-                        'authors': ', '.join([author.name for author in result.authors]),
-                        'published': result.published,
-                        'url': result.pdf_url,
-                        'categories': result.categories
-                    })
-                    
-                papers.extend(batch_papers)
-                progress = len(papers) / count
-                st.progress(progress, text=f"Fetched {len(papers)}/{count} papers...")
+                self._extend_unique(papers, seen_ids, batch_papers)
+                if show_progress:
+                    st.progress(len(papers) / count, text=f"Fetched {len(papers)}/{count} papers...")
                 
                 if topic:
                     print(f"Successfully fetched {len(batch_papers)} papers for topic: {topic}")
                 else:
                     print(f"Successfully fetched {len(batch_papers)} papers from category: {query}")
                     
-                # Add delay between batches to avoid rate limiting
-                time.sleep(1)
-                
             except Exception as e:
                 print(f"Error fetching papers: {str(e)}")
                 max_retries -= 1
-                time.sleep(1)  # Add delay between retries
         
-        # Ensure we don't exceed the requested count
-        if len(papers) > count:
-            papers = random.sample(papers, count)
-        elif len(papers) < count:
+        # Each batch asks for at most the papers still missing, so there is
+        # never more than count to trim
+        if len(papers) < count:
+            print(f"Warning: Only able to fetch {len(papers)} papers out of {count} requested")
+            
+        return papers
+
+    def _fetch_batch(self, query: str, sort_by: arxiv.SortCriterion, max_results: int, offset: int) -> List[Dict]:
+        """Fetch one batch of results through the arxiv client, reusing cached pages."""
+        key = self._page_key(query, sort_by.value, max_results, offset)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Wait for our slot up front instead of sleeping after every batch
+        self._rate_limiter.acquire()
+        search = arxiv.Search(query=query, max_results=max_results, sort_by=sort_by)
+        batch_papers = []
+        for result in self.client.results(search, offset=offset):
+            batch_papers.append({
+                'id': result.get_short_id(),
+                'title': result.title,
+                'abstract': result.summary,
+                'authors': ', '.join(map(_author_name, result.authors)),
+                'published': result.published,
+                'url': result.pdf_url,
+                'categories': result.categories
+            })
+        
+        if batch_papers:
+            self._cache.set(key, batch_papers, expire=PAGE_CACHE_TTL)
+        return batch_papers
+
+    @staticmethod
+    def _page_key(query: str, sort_by: str, max_results: int, offset: int) -> str:
+        """Stable cache key for one page of query results."""
+        return hashlib.blake2b(f"{query}|{sort_by}|{max_results}|{offset}".encode(), digest_size=16).hexdigest()
+
+    async def fetch_papers_async(self, count: int = 1000, topic: str = None, max_concurrency: int = 4,
+                                 show_progress: bool = True, batch_size: int = 25) -> List[Dict]:
+        """Fetch papers from arXiv, requesting result pages concurrently."""
+        categories = ["cs", "physics", "math"]
+        sort_by = "relevance" if topic else "submittedDate"
+        
+        progress_bar = None
+        if show_progress and st is not None:
+            progress_bar = st.progress(0.0, text="Initializing paper fetch...")
+        semaphore = asyncio.BoundedSemaphore(max_concurrency)
+        fetched = 0
+        
+        async def fetch_page(client, query, offset, max_results):
+            nonlocal fetched
+            # Cached pages skip the request and never wait on the rate limiter
+            batch_papers = self._cache.get(self._page_key(query, sort_by, max_results, offset))
+            if batch_papers is None:
+                async with semaphore:
+                    batch_papers = await self._fetch_page_async(client, query, sort_by, offset, max_results)
+            fetched += len(batch_papers)
+            if progress_bar is not None:
+                progress_bar.progress(min(fetched / count, 1.0), text=f"Fetched {fetched}/{count} papers...")
+            return batch_papers
+        
+        papers = []
+        # Cross-listed papers can come back from more than one category query
+        seen_ids = set()
+        # Next unread offset of each query, carried across rounds
+        query_offsets = {}
+        # Rounds in a row allowed to bring back nothing new before giving up
+        max_retries = 3
+        
+        async with httpx.AsyncClient(timeout=30) as client:
+            # Each round plans pages for the papers still missing, so duplicates
+            # dropped in one round are made up by the next
+            while len(papers) < count and max_retries > 0:
+                missing = count - len(papers)
+                pages = []
+                for start in range(0, missing, batch_size):
+                    if topic:
+                        query = f"all:{topic}"
+                    else:
+                        # Randomly select a category per page for diversity
+                        category = random.choice(categories)
+                        query = f"cat:{category}.*"
+                    offset = query_offsets.get(query, 0)
+                    size = min(batch_size, missing - start)
+                    # Advance by what this page asks for, so a later round
+                    # resumes right after it instead of skipping results
+                    query_offsets[query] = offset + size
+                    pages.append((query, offset, size))
+                
+                batches = await asyncio.gather(*(fetch_page(client, *page) for page in pages))
+                
+                # Keep page order so relevance ranking is preserved for topic searches
+                found = len(papers)
+                for batch in batches:
+                    self._extend_unique(papers, seen_ids, batch)
+                if len(papers) == found:
+                    # Nothing new came back; the queries may be exhausted or failing
+                    max_retries -= 1
+                else:
+                    max_retries = 3
+        
+        if len(papers) < count:
             print(f"Warning: Only able to fetch {len(papers)} papers out of {count} requested")
             
+        return papers[:count]
+
+    @staticmethod
+    def _extend_unique(papers: List[Dict], seen_ids: set, batch_papers: List[Dict]) -> None:
+        """Append the papers of a batch whose arXiv IDs have not been seen yet."""
+        for paper in batch_papers:
+            if paper['id'] not in seen_ids:
+                seen_ids.add(paper['id'])
+                papers.append(paper)
+
+    async def _fetch_page_async(self, client: httpx.AsyncClient, query: str, sort_by: str,
+                                offset: int, max_results: int, max_retries: int = 3) -> List[Dict]:
+        """Fetch and parse one page of arXiv API results with exponential backoff."""
+        params = {
+            'search_query': query,
+            'start': offset,
+            'max_results': max_results,
+            'sortBy': sort_by,
+            'sortOrder': 'descending'
+        }
+        retry_delay = 1
+        
+        for attempt in range(max_retries):
+            try:
+                await self._rate_limiter.acquire_async()
+                response = await client.get(ARXIV_API_URL, params=params)
+                response.raise_for_status()
+                batch_papers = self._parse_feed(response.content)
+                print(f"Successfully fetched {len(batch_papers)} papers for query: {query} (offset {offset})")
+                if batch_papers:
+                    self._cache.set(self._page_key(query, sort_by, max_results, offset), batch_papers, expire=PAGE_CACHE_TTL)
+                return batch_papers
+                
+            except httpx.HTTPStatusError as e:
+                print(f"Error fetching papers on attempt {attempt + 1}: {str(e)}")
+                # Honor the server's own wait when it says how long to back off
+                retry_after = self._retry_after(e.response)
+                await asyncio.sleep(retry_after if retry_after is not None else retry_delay)
+                retry_delay = min(retry_delay * 2, 32)
+                
+            except (httpx.HTTPError, ET.ParseError, ValueError) as e:
+                print(f"Error fetching papers on attempt {attempt + 1}: {str(e)}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 32)
+        
+        return []
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Seconds a rate-limited or unavailable response asks us to wait, if given."""
+        if response.status_code not in (429, 503):
+            return None
+        try:
+            return max(0.0, float(response.headers['Retry-After']))
+        except (KeyError, ValueError):
+            return None
+
+    def _parse_feed(self, feed: bytes) -> List[Dict]:
+        """Parse an arXiv Atom feed into paper dicts matching fetch_papers output."""
+        papers = []
+        # Stream entries and drop each one once it has been read, so only the
+        # extracted fields stay in memory
+        for _, entry in ET.iterparse(io.BytesIO(feed)):
+            if entry.tag != ATOM_ENTRY_TAG:
+                continue
+            pdf_url = next(
+                (link.get('href') for link in entry.iterfind('atom:link', ATOM_NS) if link.get('title') == 'pdf'),
+                None
+            )
+            papers.append({
+                'id': entry.findtext('atom:id', '', ATOM_NS).split('/abs/')[-1],
+                'title': re.sub(r'\s+', ' ', entry.findtext('atom:title', '', ATOM_NS)).strip(),
+                'abstract': entry.findtext('atom:summary', '', ATOM_NS).strip(),
+                'authors': ', '.join(author.findtext('atom:name', '', ATOM_NS) for author in entry.iterfind('atom:author', ATOM_NS)),
+                'published': datetime.fromisoformat(entry.findtext('atom:published', '', ATOM_NS).replace('Z', '+00:00')),
+                'url': pdf_url,
+                'categories': [category.get('term') for category in entry.iterfind('atom:category', ATOM_NS)]
+            })
+            entry.clear()
         return papers
 
     def create_dataframe(self, papers: List[Dict]) -> pd.DataFrame:
         """Convert papers list to DataFrame."""
-        return pd.DataFrame(papers)
\ No newline at end of file
+        # Build column by column from the known fields instead of letting
+        # pandas discover the keys of every dict
+        columns = {field: [paper[field] for paper in papers] for field in PAPER_FIELDS}
+        # Freeze category lists so the column holds immutable, hashable values
+        columns['categories'] = [tuple(categories) for categories in columns['categories']]
+        return pd.DataFrame(columns)
\ No newline at end of file
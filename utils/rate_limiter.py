@@ -0,0 +1,39 @@
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """Client-side rate limiter shared by threads and event loops.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Each call
+    reserves one token up front, so concurrent callers queue fairly and each
+    only waits for its own slot.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
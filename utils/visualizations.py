@@ -4,8 +4,57 @@ from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 import networkx as nx
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+# Similarity network edges: each paper links to at most this many of its
+# closest papers, and only when their similarity clears the threshold
+SIMILARITY_NEIGHBORS = 10
+SIMILARITY_THRESHOLD = 0.3
+
+# Spring layouts of recent similarity graphs, keyed by a digest of the edges,
+# so re-rendering unchanged data skips the force-directed iterations
+LAYOUT_CACHE_SIZE = 8
+_layout_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_layout_lock = threading.Lock()
+
+# Timeline sizes past which per-point hover becomes too slow in the browser,
+# and past which papers are binned into one marker per day
+TIMELINE_HOVER_LIMIT = 20000
+TIMELINE_DOWNSAMPLE_LIMIT = 50000
+
+class MetricColumns(NamedTuple):
+    """Metric columns of an analysis frame and their category display labels."""
+    issues: pd.Index
+    confidence: pd.Index
+    issue_labels: pd.Index
+    confidence_labels: pd.Index
+
+@lru_cache(maxsize=32)
+def _metric_columns(columns: tuple) -> MetricColumns:
+    """Split a frame schema into its issues and confidence columns.
+
+    Keyed on the column names rather than the frame, so every figure built
+    from the same results (or a copy of them) scans the schema and strips
+    the category labels only once.
+    """
+    columns = pd.Index(columns)
+    issues = columns[columns.str.contains('issues', regex=False)]
+    confidence = columns[columns.str.contains('confidence', regex=False)]
+    return MetricColumns(
+        issues,
+        confidence,
+        issues.str.replace('_issues', ''),
+        confidence.str.replace('_confidence', '')
+    )
 
 class Visualizer:
+    # Error distribution risk labels, indexed by severity code 0/1/2
+    SEVERITY_LEVELS = np.array(['Low Risk', 'Moderate Risk', 'High Risk'])
+
     def __init__(self):
         self.colors = {
             'background': '#FAFAFA',
@@ -14,51 +63,46 @@ class Visualizer:
             'highlight2': '#1F77B4',
             'highlight3': '#2CA02C'
         }
+        # Bar colors by severity code: navy, orange, red
+        self.severity_colors = np.array([self.colors['navy'], '#FFA500', self.colors['highlight1']])
+
+    def _cols(self, df: pd.DataFrame) -> MetricColumns:
+        """Return the metric columns of an analysis frame with their labels."""
+        return _metric_columns(tuple(df.columns))
 
     def create_error_distribution(self, df: pd.DataFrame) -> go.Figure:
         """Create enhanced error distribution visualization with hover data and patterns."""
-        error_counts = df[[col for col in df.columns if 'issues' in col]].sum()
-        confidence_avgs = df[[col for col in df.columns if 'confidence' in col]].mean()
-        severity_levels = []
-        
-        # Calculate severity levels
-        for cat in error_counts.index:
-            avg_issues = error_counts[cat]
-            avg_conf = confidence_avgs[cat.replace('_issues', '_confidence')]
-            if avg_issues > error_counts.mean() and avg_conf < confidence_avgs.mean():
-                severity = 'High Risk'
-            elif avg_issues > error_counts.mean() or avg_conf < confidence_avgs.mean():
-                severity = 'Moderate Risk'
-            else:
-                severity = 'Low Risk'
-            severity_levels.append(severity)
+        cols = self._cols(df)
+        issues_cols = cols.issues
+        # Pair every issue category with its confidence column and read both
+        # into one block, so the sums and means come from a single pass
+        confidence_cols = issues_cols.str.replace('_issues', '_confidence')
+        block = df[issues_cols.append(confidence_cols)].to_numpy(dtype=np.float64)
+        totals = block.sum(axis=0)
+        n_issues = len(issues_cols)
+        error_counts = pd.Series(totals[:n_issues].astype(np.int64), index=issues_cols)
+        with np.errstate(invalid='ignore'):
+            confidence_avgs = pd.Series(totals[n_issues:] / len(block), index=confidence_cols)
+        
+        # Severity code: 2 = many issues and low confidence, 1 = either, 0 = neither
+        issues_high = error_counts.to_numpy() > error_counts.mean()
+        conf_low = confidence_avgs.to_numpy() < confidence_avgs.mean()
+        severity_code = issues_high.astype(np.intp) + conf_low
+        severity_levels = np.take(self.SEVERITY_LEVELS, severity_code)
         
         # Create hover text with enhanced information
-        hover_text = [
-            f"Category: {cat.replace('_issues', '')}<br>" +
-            f"Total Issues: {issues}<br>" +
-            f"Avg Confidence: {conf:.1f}%<br>" +
-            f"Risk Level: {sev}"
-            for cat, issues, conf, sev in zip(
-                error_counts.index,
-                error_counts.values,
-                confidence_avgs.values,
-                severity_levels
-            )
-        ]
-        
-        # Color mapping based on severity
-        color_map = {
-            'High Risk': self.colors['highlight1'],
-            'Moderate Risk': '#FFA500',  # Orange
-            'Low Risk': self.colors['navy']
-        }
+        hover_text = (
+            "Category: " + cols.issue_labels +
+            "<br>Total Issues: " + error_counts.astype(str).to_numpy() +
+            "<br>Avg Confidence: " + confidence_avgs.map('{:.1f}'.format).to_numpy() +
+            "%<br>Risk Level: " + severity_levels
+        )
         
         fig = go.Figure(data=[
             go.Bar(
                 x=error_counts.index,
                 y=error_counts.values,
-                marker_color=[color_map[sev] for sev in severity_levels],
+                marker_color=np.take(self.severity_colors, severity_code),
                 hovertext=hover_text,
                 hoverinfo='text',
                 text=severity_levels,
@@ -89,16 +133,21 @@ class Visualizer:
 
     def create_confidence_heatmap(self, df: pd.DataFrame) -> go.Figure:
         """Create enhanced confidence score heatmap with temporal patterns."""
-        confidence_cols = [col for col in df.columns if 'confidence' in col]
+        cols = self._cols(df)
+        confidence_cols = cols.confidence
         
-        # Group by time periods for temporal analysis
-        df['month'] = pd.to_datetime(df['published']).dt.strftime('%Y-%m')
-        temporal_confidence = df.groupby('month')[confidence_cols].mean().tail(6)  # Last 6 months
+        # Group by time periods for temporal analysis, keeping only rows from
+        # the last 6 months that have papers before aggregating
+        published = pd.to_datetime(df['published'])
+        month = published.dt.year * 12 + published.dt.month - 1
+        recent = month >= month.drop_duplicates().nlargest(6).min()
+        temporal_confidence = df.loc[recent, confidence_cols].groupby(month[recent]).mean()
+        temporal_confidence.index = [f"{int(code) // 12}-{int(code) % 12 + 1:02d}" for code in temporal_confidence.index]
         
         # Create enhanced heatmap
         fig = go.Figure(data=go.Heatmap(
             z=temporal_confidence.values,
-            x=[col.replace('_confidence', '') for col in confidence_cols],
+            x=cols.confidence_labels,
             y=temporal_confidence.index,
             colorscale='RdYlBu',
             showscale=True,
@@ -131,22 +180,41 @@ class Visualizer:
         """Create enhanced timeline view with trend analysis."""
         # Calculate moving averages for smoother trends
         window_size = 7
-        df = df.sort_values('published')
-        df['total_issues'] = df[[col for col in df.columns if 'issues' in col]].sum(axis=1)
-        df['ma_issues'] = df['total_issues'].rolling(window=window_size).mean()
+        issues_cols = self._cols(df).issues
+        # Work on arrays in publication order instead of a sorted copy of the frame
+        order = np.argsort(df['published'].to_numpy(), kind='stable')
+        published = df['published'].iloc[order]
+        total_issues = df[issues_cols].to_numpy().sum(axis=1)[order]
+        # Trailing mean over the last window_size papers, undefined until the
+        # window fills; window sums come from differences of one running sum
+        ma_issues = np.full(len(total_issues), np.nan)
+        if len(total_issues) >= window_size:
+            csum = np.concatenate(([0], np.cumsum(total_issues)))
+            ma_issues[window_size - 1:] = (csum[window_size:] - csum[:-window_size]) / window_size
+        
+        # Very large timelines show one marker per day: the mean issue count
+        # and the first paper's title of that day
+        marker_x, marker_y = published, total_issues
+        marker_titles = df['title'].to_numpy()[order]
+        if len(total_issues) > TIMELINE_DOWNSAMPLE_LIMIT:
+            daily = pd.DataFrame({'issues': total_issues, 'title': marker_titles}).groupby(
+                pd.DatetimeIndex(published).floor('D'), sort=True
+            ).agg(issues=('issues', 'mean'), title=('title', 'first'))
+            marker_x, marker_y, marker_titles = daily.index, daily['issues'].to_numpy(), daily['title'].to_numpy()
         
         # Create main scatter plot
         fig = go.Figure()
         
-        # Add individual points
-        fig.add_trace(go.Scatter(
-            x=df['published'],
-            y=df['total_issues'],
+        # Add individual points; WebGL keeps rendering fast with many papers,
+        # at the cost of markers rasterized rather than vector in exports
+        fig.add_trace(go.Scattergl(
+            x=marker_x,
+            y=marker_y,
             mode='markers',
             name='Individual Papers',
             marker=dict(
                 size=8,
-                color=df['total_issues'],
+                color=marker_y,
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title="Issue Count")
@@ -157,13 +225,13 @@ class Visualizer:
                 "Issues: %{y}",
                 "<extra></extra>"
             ]),
-            customdata=df[['title']]
+            customdata=marker_titles[:, np.newaxis]
         ))
         
         # Add trend line
         fig.add_trace(go.Scatter(
-            x=df['published'],
-            y=df['ma_issues'],
+            x=published,
+            y=ma_issues,
             mode='lines',
             name=f'{window_size}-Day Moving Average',
             line=dict(color='red', width=2)
@@ -191,29 +259,18 @@ class Visualizer:
                 bgcolor="rgba(255, 255, 255, 0.8)"
             )
         )
+        if len(total_issues) > TIMELINE_HOVER_LIMIT:
+            # Closest-point hover searches every marker on each mouse move
+            fig.update_layout(hovermode='x', spikedistance=0)
         
         return fig
         
     def create_correlation_heatmap(self, df: pd.DataFrame) -> go.Figure:
         """Create correlation heatmap between different error categories."""
         # Extract issues columns
-        issues_cols = [col for col in df.columns if 'issues' in col]
+        issues_cols = self._cols(df).issues
         correlation_matrix = df[issues_cols].corr()
         
-        # Create annotation text
-        annotations = []
-        for i, row in enumerate(correlation_matrix.values):
-            for j, value in enumerate(row):
-                annotations.append(
-                    dict(
-                        x=correlation_matrix.columns[j],
-                        y=correlation_matrix.index[i],
-                        text=f"{value:.2f}",
-                        font=dict(color='white' if abs(value) > 0.4 else 'black'),
-                        showarrow=False
-                    )
-                )
-        
         fig = go.Figure(data=go.Heatmap(
             z=correlation_matrix,
             x=correlation_matrix.columns,
@@ -221,7 +278,11 @@ class Visualizer:
             colorscale='RdBu',
             zmid=0,
             showscale=True,
-            colorbar=dict(title="Correlation")
+            colorbar=dict(title="Correlation"),
+            # Cell labels are drawn by the heatmap itself, which picks a text
+            # color contrasting with each cell
+            text=np.char.mod('%.2f', correlation_matrix.to_numpy()),
+            texttemplate='%{text}'
         ))
         
         fig.update_layout(
@@ -235,8 +296,7 @@ class Visualizer:
             xaxis_title="Error Category",
             yaxis_title="Error Category",
             plot_bgcolor=self.colors['background'],
-            paper_bgcolor=self.colors['background'],
-            annotations=annotations
+            paper_bgcolor=self.colors['background']
         )
         
         return fig
@@ -244,63 +304,23 @@ class Visualizer:
     def create_paper_similarity_network(self, df: pd.DataFrame) -> go.Figure:
         """Create interactive paper similarity network visualization."""
         # Calculate similarity scores between papers based on their error patterns
-        error_cols = [col for col in df.columns if 'issues' in col]
-        
-        # Ensure we have numeric data
-        numeric_df = df[error_cols].fillna(0).astype(float)
-        
-        # Initialize similarity matrix with zeros
-        n_papers = len(numeric_df)
-        similarity_matrix = np.zeros((n_papers, n_papers))
-        
-        # Calculate similarities
-        for i in range(n_papers):
-            for j in range(n_papers):
-                if i != j:
-                    paper1 = numeric_df.iloc[i].values
-                    paper2 = numeric_df.iloc[j].values
-                    # Avoid division by zero
-                    norm1 = np.linalg.norm(paper1)
-                    norm2 = np.linalg.norm(paper2)
-                    if norm1 > 0 and norm2 > 0:
-                        similarity_matrix[i, j] = np.dot(paper1, paper2) / (norm1 * norm2)
-        
-        # Convert to pandas DataFrame for networkx
-        similarity_df = pd.DataFrame(
-            similarity_matrix,
-            index=numeric_df.index,
-            columns=numeric_df.index
-        )
+        error_cols = self._cols(df).issues
         
-        # Create network layout
-        G = nx.from_numpy_array(similarity_matrix)
-        pos = nx.spring_layout(G, k=1, iterations=50)
+        # Similarity and layout depend only on the issue counts; the rest of
+        # this method just assembles the Plotly traces
+        X = df[error_cols].fillna(0).to_numpy(dtype=np.float32)
+        node_xy, edge_xy = self._similarity_layout(X)
         
         # Create edges (connections between similar papers)
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-            
         edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
+            x=edge_xy[:, 0], y=edge_xy[:, 1],
             line=dict(width=0.5, color='#888'),
             hoverinfo='none',
             mode='lines')
         
         # Create nodes (papers)
-        node_x = []
-        node_y = []
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            
         node_trace = go.Scatter(
-            x=node_x, y=node_y,
+            x=node_xy[:, 0], y=node_xy[:, 1],
             mode='markers+text',
             hoverinfo='text',
             marker=dict(
@@ -318,9 +338,8 @@ class Visualizer:
             textposition="top center"
         )
         
-        # Color nodes by total error count
-        node_colors = df[error_cols].sum(axis=1)
-        node_trace.marker.color = node_colors
+        # Color nodes by total error count, reusing the matrix built above
+        node_trace.marker.color = X.sum(axis=1)
         
         # Create the figure
         fig = go.Figure(data=[edge_trace, node_trace],
@@ -337,6 +356,62 @@ class Visualizer:
         
         return fig
         
+    def _similarity_layout(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lay out papers so that those with similar issue patterns sit close together.
+
+        Returns node positions as an (n, 2) array and edge segments as a
+        (3 * edges, 2) array where NaN rows separate consecutive segments.
+        """
+        # Cosine similarity of every pair in one matrix product; rows without
+        # issues get a unit norm so their similarities stay zero
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        Xn = X / norms
+        similarity_matrix = Xn @ Xn.T
+        np.fill_diagonal(similarity_matrix, 0.0)
+        
+        # Keep a sparse edge list instead of the fully connected graph, which
+        # would make the layout and the edge trace quadratic in the papers
+        n_papers = len(similarity_matrix)
+        G = nx.Graph()
+        G.add_nodes_from(range(n_papers))
+        rows = cols = np.empty(0, dtype=np.intp)
+        weights = np.empty(0, dtype=similarity_matrix.dtype)
+        k = min(SIMILARITY_NEIGHBORS, n_papers - 1)
+        if k > 0:
+            neighbors = np.argpartition(-similarity_matrix, k - 1, axis=1)[:, :k]
+            rows = np.repeat(np.arange(n_papers), k)
+            cols = neighbors.ravel()
+            weights = similarity_matrix[rows, cols]
+            keep = weights > SIMILARITY_THRESHOLD
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+            G.add_weighted_edges_from(zip(rows.tolist(), cols.tolist(), weights.tolist()))
+        
+        # Create network layout; the seeded layout depends only on the graph,
+        # so an identical edge list can reuse an earlier result
+        digest = hashlib.blake2b(
+            np.int64(n_papers).tobytes() + rows.tobytes() + cols.tobytes() + weights.tobytes(),
+            digest_size=16
+        ).hexdigest()
+        with _layout_lock:
+            node_xy = _layout_cache.get(digest)
+            if node_xy is not None:
+                _layout_cache.move_to_end(digest)
+        if node_xy is None:
+            pos = nx.spring_layout(G, k=1, iterations=50, seed=0)
+            node_xy = np.array([pos[node] for node in range(n_papers)], dtype=float).reshape(n_papers, 2)
+            node_xy.flags.writeable = False
+            with _layout_lock:
+                _layout_cache[digest] = node_xy
+                if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+                    _layout_cache.popitem(last=False)
+        
+        edges = np.array(G.edges(), dtype=np.intp).reshape(-1, 2)
+        edge_xy = np.full((len(edges), 3, 2), np.nan)
+        edge_xy[:, 0] = node_xy[edges[:, 0]]
+        edge_xy[:, 1] = node_xy[edges[:, 1]]
+        return node_xy, edge_xy.reshape(-1, 2)
+        
     def create_topic_distribution(self, df: pd.DataFrame) -> go.Figure:
         """Create topic distribution visualization using categories."""
         try:
@@ -351,15 +426,16 @@ class Visualizer:
                 )
                 return fig
 
-            # Extract categories and count papers per category
-            categories = []
-            for cats in df['categories'].fillna([]):
-                if isinstance(cats, (list, tuple)):
-                    categories.extend(cats)
-                elif isinstance(cats, str):
-                    categories.append(cats)
+            # Count papers per category; explode flattens lists and tuples, keeps
+            # single category strings as they are and drops empty entries.
+            # Counting the integer category codes avoids hashing every string.
+            exploded = df['categories'].explode().astype('category')
+            code_counts = pd.Series(exploded.cat.codes).value_counts().drop(-1, errors='ignore')
+            category_counts = pd.Series(
+                code_counts.to_numpy(), index=exploded.cat.categories[code_counts.index]
+            )
                     
-            if not categories:
+            if category_counts.empty:
                 fig = go.Figure()
                 fig.add_annotation(
                     text="No categories found in the data",
@@ -368,8 +444,6 @@ class Visualizer:
                     font=dict(size=20)
                 )
                 return fig
-                
-            category_counts = pd.Series(categories).value_counts()
             
             # Create sunburst chart
             fig = go.Figure(go.Sunburst(
@@ -409,40 +483,53 @@ class Visualizer:
         
     def create_trend_analysis(self, df: pd.DataFrame) -> go.Figure:
         """Create trend analysis visualization showing patterns over time."""
-        # Prepare time series data
-        df['date'] = pd.to_datetime(df['published'])
-        df.set_index('date', inplace=True)
-        df_resampled = df[[col for col in df.columns if 'issues' in col]].resample('W').mean()
+        # Prepare time series data; resample on a date column attached to the
+        # selected issues instead of re-indexing the caller's frame
+        cols = self._cols(df)
+        issues_cols = cols.issues
+        df_resampled = (
+            df[issues_cols]
+            .assign(date=pd.to_datetime(df['published']))
+            .resample('W', on='date')
+            .mean()
+        )
         
         # Create figure with secondary y-axis
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
         # Add traces for each error category
-        for col in df_resampled.columns:
+        for col, label in zip(df_resampled.columns, cols.issue_labels):
             fig.add_trace(
                 go.Scatter(
                     x=df_resampled.index,
                     y=df_resampled[col],
-                    name=col.replace('_issues', ''),
+                    name=label,
                     mode='lines+markers'
                 ),
                 secondary_y=False
             )
         
-        # Calculate and add trend line
-        for col in df_resampled.columns:
-            z = np.polyfit(range(len(df_resampled.index)), df_resampled[col], 1)
-            p = np.poly1d(z)
-            fig.add_trace(
-                go.Scatter(
-                    x=df_resampled.index,
-                    y=p(range(len(df_resampled.index))),
-                    name=f"{col.replace('_issues', '')} trend",
-                    line=dict(dash='dash'),
-                    opacity=0.5
-                ),
-                secondary_y=False
-            )
+        # Fit every category's linear trend in one least-squares solve; weeks
+        # without papers have no mean and are left out of the fit
+        x = np.arange(len(df_resampled.index), dtype=np.float64)
+        Y = df_resampled.to_numpy(dtype=np.float64)
+        observed = np.isfinite(Y).all(axis=1)
+        if observed.sum() >= 2:
+            coeffs = np.polynomial.polynomial.polyfit(x[observed], Y[observed], deg=1)
+            trends = np.polynomial.polynomial.polyval(x, coeffs)
+            
+            # Calculate and add trend line
+            for label, trend in zip(cols.issue_labels, trends):
+                fig.add_trace(
+                    go.Scatter(
+                        x=df_resampled.index,
+                        y=trend,
+                        name=f"{label} trend",
+                        line=dict(dash='dash'),
+                        opacity=0.5
+                    ),
+                    secondary_y=False
+                )
         
         fig.update_layout(
             title={